@@ -28,6 +28,20 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 # Initialize logger
 logger = logging.getLogger("delete_thread")
 
+# Reused OpenAI client - the SDK client keeps a pooled HTTPS connection, so
+# building one per call pays a fresh TLS handshake for nothing
+_openai_client = None
+_openai_client_key = None
+
+def _get_openai_client(api_key):
+    """Return a cached OpenAI client for the given API key."""
+    global _openai_client, _openai_client_key
+
+    if _openai_client is None or _openai_client_key != api_key:
+        _openai_client = OpenAI(api_key=api_key)
+        _openai_client_key = api_key
+    return _openai_client
+
 def load_openai_config():
     """Load OpenAI configuration from JSON file"""
     try:
@@ -101,7 +115,7 @@ def delete_thread(thread_id=None, update_config=True):
         return False
     
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    client = _get_openai_client(api_key)
     
     try:
         # Delete the thread
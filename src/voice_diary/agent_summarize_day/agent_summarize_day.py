@@ -7,18 +7,29 @@ defined in the configuration file, and uses OpenAI Assistants API to summarize t
 and save to a text file.
 """
 
+import functools
 import json
 import logging
 import logging.handlers
 import os
 import sys
-import yaml
 import time
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
-from openai import OpenAI
 
-from voice_diary.db_utils.db_manager import get_transcriptions_by_date_range, save_day_summary, check_summary_exists
+from voice_diary.db_utils.db_manager import (
+    get_transcriptions_by_date_range,
+    save_day_summary,
+    check_summary_exists,
+    get_summary_by_date_range,
+)
+
+# Optional fast JSON parser - stdlib json remains the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize paths - handling both frozen (PyInstaller) and regular Python execution
 if getattr(sys, 'frozen', False):
@@ -44,11 +55,53 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 # Initialize logger
 logger = logging.getLogger("summarize_day")
 
+# OpenAI client class - imported lazily on first use because the SDK is heavy
+# and is not needed when this module is imported for its helper functions
+OpenAI = None
+
+# Resolved on first load_prompts call: the libyaml C loader when available,
+# otherwise the pure-Python SafeLoader. yaml itself is imported lazily there
+# as well - the prompts file is only needed for actual summarization runs.
+_YAML_LOADER = None
+
+# Parsed prompts cache: ((mtime_ns, size), prompts) - same validation scheme
+# as the JSON config cache below
+_prompts_cache = None
+
+# Cached OpenAI client, keyed by (client class, api key) - reusing the client
+# keeps its HTTP connection pool (and TLS session) alive across calls
+_openai_client = None
+_openai_client_key = None
+
+# Cache of parsed config files keyed by path - the config is loaded again by
+# helper functions within a single run, so the file is only parsed once.
+# Each entry stores ((mtime_ns, size), parsed_dict) so an edited config is
+# picked up without restarting a long-running process.
+_config_cache = {}
+
+def _load_json_file(path):
+    """Parse a JSON config file, preferring orjson when installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 def load_config():
-    """Load configuration from JSON file"""
+    """Load configuration from JSON file (re-parsed only when the file changes)"""
+    cache_key = str(CONFIG_PATH)
+    try:
+        stat_result = CONFIG_PATH.stat()
+        file_state = (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        file_state = None
+    cached = _config_cache.get(cache_key)
+    if cached is not None and cached[0] == file_state:
+        return cached[1]
     try:
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        config = _load_json_file(CONFIG_PATH)
+        _config_cache[cache_key] = (file_state, config)
+        return config
     except Exception as e:
         logger.error(f"Error loading configuration: {str(e)}")
         sys.exit(1)
@@ -56,24 +109,59 @@ def load_config():
 def load_openai_config():
     """Load OpenAI configuration from JSON file"""
     try:
-        with open(OPENAI_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _load_json_file(OPENAI_CONFIG_PATH)
     except Exception as e:
         logger.error(f"Error loading OpenAI configuration: {str(e)}")
         sys.exit(1)
 
 def load_prompts():
     """Load prompt templates from YAML file"""
+    global _YAML_LOADER, _prompts_cache
+    import yaml
+
+    if _YAML_LOADER is None:
+        _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     try:
-        with open(PROMPTS_PATH, 'r', encoding='utf-8') as f:
-            prompts_data = yaml.safe_load(f)
-            return prompts_data.get('prompts', {})
+        # Prompts rarely change, so skip the YAML parse entirely while the
+        # file's mtime and size are unchanged (same scheme as load_config)
+        try:
+            stat_result = PROMPTS_PATH.stat()
+            file_state = (stat_result.st_mtime_ns, stat_result.st_size)
+        except OSError:
+            file_state = None
+
+        if (file_state is not None and _prompts_cache is not None
+                and _prompts_cache[0] == file_state):
+            return _prompts_cache[1]
+
+        # Read the whole file as bytes with a generous buffer - yaml accepts
+        # bytes directly, which skips the TextIOWrapper decode overhead
+        with open(PROMPTS_PATH, 'rb', buffering=131072) as f:
+            data = f.read()
+        prompts_data = yaml.load(data, Loader=_YAML_LOADER)
+        prompts = prompts_data.get('prompts', {})
+        if file_state is not None:
+            _prompts_cache = (file_state, prompts)
+        return prompts
     except Exception as e:
         logger.error(f"Error loading prompt templates: {str(e)}")
         sys.exit(1)
 
+def _save_openai_config(openai_config):
+    """Write the OpenAI config back to disk (single serialization point)."""
+    with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
+        json.dump(openai_config, f, indent=2)
+
+# Set once setup_logging has run - the scheduler calls summarize_day every
+# day in the same process and must not stack a new pair of handlers each time
+_LOGGING_CONFIGURED = False
+
 def setup_logging(config):
     """Setup logging based on configuration"""
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+
     log_config = config.get("logging", {})
     log_level = getattr(logging, log_config.get("log_level", "INFO"))
     
@@ -94,7 +182,8 @@ def setup_logging(config):
     file_handler = logging.handlers.RotatingFileHandler(
         LOG_DIR / log_file,
         maxBytes=max_bytes,
-        backupCount=backup_count
+        backupCount=backup_count,
+        delay=True  # don't open the log file until something is written
     )
     file_handler.setLevel(log_level)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -119,25 +208,38 @@ def setup_logging(config):
         openai_handler = logging.handlers.RotatingFileHandler(
             openai_log_file,
             maxBytes=openai_log_config.get('openai_usage_max_size_bytes', 1048576),  # Default 1MB
-            backupCount=openai_log_config.get('openai_usage_backup_count', 3)        # Default 3 backups
+            backupCount=openai_log_config.get('openai_usage_backup_count', 3),       # Default 3 backups
+            delay=True
         )
         
         # Simple formatter for OpenAI usage log (just the message)
         openai_formatter = logging.Formatter('%(message)s')
         openai_handler.setFormatter(openai_formatter)
         openai_logger.addHandler(openai_handler)
-    
+
+    _LOGGING_CONFIGURED = True
     logger.info("Logging configured successfully")
 
-def process_with_openai_assistant(transcriptions, prompt_template, openai_config, prompts=None):
+def process_with_openai_assistant(transcriptions, prompt_template, openai_config, prompts=None, app_config=None):
     """Process the transcriptions with OpenAI Assistants API using the prompt template."""
-    # Format journal content from transcriptions
-    journal_content = format_transcriptions_for_llm(transcriptions)
-    
-    # Format the prompt with the journal content
-    prompt = prompt_template.format(
-        journal_content=journal_content
-    )
+    # Nothing to summarize - skip the API round-trip entirely rather than
+    # sending the model an empty journal
+    if not transcriptions:
+        logger.info("No transcriptions to process; skipping OpenAI call")
+        return "No transcriptions found for the requested date range."
+
+    # Format journal content from transcriptions. All entries for the range
+    # ride in this one request - batching them behind a single prompt costs
+    # one round-trip total instead of one per transcription.
+    journal_content = format_transcriptions_for_llm(transcriptions, app_config)
+    
+    # Format the prompt with the journal content - the template's only
+    # placeholder is {journal_content}, so a plain replace skips the full
+    # str.format parser (and tolerates literal braces in the template)
+    if "{journal_content}" in prompt_template:
+        prompt = prompt_template.replace("{journal_content}", journal_content)
+    else:
+        prompt = prompt_template.format(journal_content=journal_content)
     
     # Set up the API client
     config = openai_config['openai_config']
@@ -147,7 +249,15 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
         logger.error("No OpenAI API key found. Set it in the config file or as an environment variable.")
         raise ValueError("No OpenAI API key found. Set it in the config file or as an environment variable.")
     
-    client = OpenAI(api_key=api_key)
+    global OpenAI, _openai_client, _openai_client_key
+    if OpenAI is None:
+        from openai import OpenAI
+
+    cache_key = (OpenAI, api_key)
+    if _openai_client is None or _openai_client_key != cache_key:
+        _openai_client = OpenAI(api_key=api_key)
+        _openai_client_key = cache_key
+    client = _openai_client
     
     try:
         # Check if we have a saved assistant_id in the config
@@ -180,31 +290,14 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
             
             # Add the assistant_id to the config for future use
             config['assistant_id'] = assistant_id
-            with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                json.dump(openai_config, f, indent=2)
-            
+            _save_openai_config(openai_config)
+
             logger.info(f"Assistant created with ID: {assistant_id}")
         else:
-            # Verify assistant exists
-            try:
-                client.beta.assistants.retrieve(assistant_id)
-                logger.info(f"Using existing Assistant with ID: {assistant_id}")
-            except Exception as e:
-                error_msg = str(e)
-                if "No assistant found" in error_msg:
-                    logger.error(f"Assistant ID {assistant_id} no longer exists on OpenAI server: {e}")
-                    # Remove the invalid assistant_id from config
-                    logger.info("Removing invalid assistant_id from config")
-                    config.pop('assistant_id', None)
-                    with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                        json.dump(openai_config, f, indent=2)
-                    
-                    # Restart the process (recursive call after fixing config)
-                    logger.info("Restarting process with updated config")
-                    return process_with_openai_assistant(transcriptions, prompt_template, openai_config, prompts)
-                else:
-                    # For other errors, propagate them
-                    raise
+            # Trust the stored assistant_id without a verification round-trip:
+            # if it was deleted server-side, the run-creation error handler
+            # below drops the stale id and retries with a fresh assistant
+            logger.info(f"Using existing Assistant with ID: {assistant_id}")
         
         # Check if we have a saved thread_id in the config
         thread_id = config.get('thread_id', None)
@@ -234,9 +327,9 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
                     config.pop('thread_id', None)
                     if 'thread_created_at' in config:
                         config.pop('thread_created_at', None)
-                    with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                        json.dump(openai_config, f, indent=2)
-                    
+                    # No save here - the new-thread branch below writes the
+                    # config once the replacement thread id is known
+
                     # Continue with a new thread
                     thread_needs_rotation = True
                     logger.info("Will create a new thread")
@@ -254,9 +347,8 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
             config['thread_id'] = thread_id
             # Store thread creation time
             config['thread_created_at'] = datetime.now().isoformat()
-            with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                json.dump(openai_config, f, indent=2)
-            
+            _save_openai_config(openai_config)
+
             logger.info(f"Thread created with ID: {thread_id}")
         else:
             logger.info(f"Using existing thread with ID: {thread_id}")
@@ -287,11 +379,15 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
                 run_id=run.id
             )
             
-            # Wait for run to complete
+            # Wait for run to complete. Poll frequently at first (short runs
+            # finish within a couple of seconds) and back off towards a 5 s
+            # interval so long runs don't hammer the API with retrieves.
             logger.info("Waiting for assistant to complete processing")
+            poll_interval = 0.5
             while run_status.status not in ["completed", "failed", "cancelled", "expired"]:
                 logger.debug(f"Run status: {run_status.status}")
-                time.sleep(1)
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 5.0)
                 run_status = client.beta.threads.runs.retrieve(
                     thread_id=thread_id,
                     run_id=run.id
@@ -340,12 +436,11 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
                 # Remove the invalid assistant_id from config
                 logger.info("Removing invalid assistant_id from config")
                 config.pop('assistant_id', None)
-                with open(OPENAI_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                    json.dump(openai_config, f, indent=2)
-                
+                _save_openai_config(openai_config)
+
                 # Restart the process (recursive call after fixing config)
                 logger.info("Restarting process with updated config")
-                return process_with_openai_assistant(transcriptions, prompt_template, openai_config, prompts)
+                return process_with_openai_assistant(transcriptions, prompt_template, openai_config, prompts, app_config)
             else:
                 logger.error(f"Error processing with OpenAI Assistant: {e}")
                 raise ValueError(f"Error processing with OpenAI Assistant: {e}")
@@ -354,33 +449,64 @@ def process_with_openai_assistant(transcriptions, prompt_template, openai_config
         logger.error(f"Error processing with OpenAI Assistant: {e}")
         raise ValueError(f"Error processing with OpenAI Assistant: {e}")
 
-def format_transcriptions_for_llm(transcriptions):
-    """Format the transcriptions into a string suitable for the LLM prompt."""
-    config = load_config()
+def format_transcriptions_for_llm(transcriptions, config=None):
+    """Format the transcriptions into a string suitable for the LLM prompt.
+
+    Callers that already hold the loaded config can pass it in to avoid a
+    redundant load_config() call; otherwise it is loaded here.
+    """
+    if config is None:
+        config = load_config()
     output_format = config.get("output", {})
     date_format = output_format.get("date_format", "%Y-%m-%d")
     
-    journal_content = ""
-    
+    # Collect parts and join once - repeated += on a string copies the
+    # whole accumulated content on every iteration
+    parts = []
+    separator = "-" * 40 + "\n\n"
+
+    # Identical recordings (accidental double uploads, repeated reminders)
+    # only need to reach the LLM once - count them up front and emit each
+    # unique content a single time with a repetition note
+    content_counts = Counter(entry.get('content', '') for entry in transcriptions)
+    seen_contents = set()
+
+    # Rows arrive ordered by created_at, so consecutive entries usually share
+    # a calendar day - format the date part once per day instead of per row
+    last_date = None
+    date_str = ""
+
     for entry in transcriptions:
         created_at = entry.get('created_at')
         content = entry.get('content', '')
-        
+
+        if content in seen_contents:
+            continue
+        seen_contents.add(content)
+
+        repeat_count = content_counts[content]
+        repeat_note = f"\n(repeated {repeat_count} times)" if repeat_count > 1 else ""
+
         # Remove reference to category_name since categories table no longer exists
         if created_at:
-            date_str = created_at.strftime(date_format)
+            entry_date = created_at.date()
+            if entry_date != last_date:
+                date_str = created_at.strftime(date_format)
+                last_date = entry_date
             time_str = created_at.strftime("%H:%M:%S")
-            journal_content += f"[{date_str} {time_str}]\n"
+            parts.append(f"[{date_str} {time_str}]\n{content}{repeat_note}\n\n{separator}")
         else:
-            journal_content += f"[No Date]\n"
-        
-        journal_content += f"{content}\n\n"
-        journal_content += "-" * 40 + "\n\n"
-    
-    return journal_content
+            parts.append(f"[No Date]\n{content}{repeat_note}\n\n{separator}")
 
+    return "".join(parts)
+
+@functools.lru_cache(maxsize=128)
 def date_from_int(date_int):
-    """Convert integer date in format YYYYMMDD to date object"""
+    """Convert integer date in format YYYYMMDD to date object
+
+    The result is memoized - the config repeats the same handful of date
+    integers across runs, so each unique value is parsed once.
+    """
     date_str = str(date_int)
     try:
         year = int(date_str[0:4])
@@ -518,6 +644,11 @@ def summarize_day():
     
     Reads date range from config, fetches transcriptions, processes them with OpenAI,
     and writes the result to file and database.
+
+    Returns:
+        str: The final summary content on success (truthy), False otherwise.
+             Callers can use the returned content directly instead of
+             re-reading the output file or querying the database.
     """
     config = load_config()
     setup_logging(config)
@@ -539,12 +670,21 @@ def summarize_day():
         logger.warning(f"A summary already exists for the date range {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         # Allow overwrite if configured
         if not config.get("allow_summary_overwrite", False):
+            # Serve the stored summary instead of re-running the OpenAI call -
+            # for repeat runs over the same range this is a free cache hit
+            existing_content = get_summary_by_date_range(start_date, end_date)
+            if existing_content:
+                logger.info("Summary overwrite not allowed; returning the existing summary from the database.")
+                return existing_content
             logger.info("Summary overwrite not allowed. Set 'allow_summary_overwrite': true in config to enable.")
             return False
         logger.info("Proceeding to overwrite existing summary as configured")
     
-    # Get transcriptions for the date range
-    transcriptions = get_transcriptions_by_date_range(start_date, end_date)
+    # Get transcriptions for the date range - the query is half-open, so the
+    # exclusive bound is the midnight after the last day, which also picks up
+    # entries in the final second that 23:59:59 would miss
+    query_end = datetime(end_date.year, end_date.month, end_date.day) + timedelta(days=1)
+    transcriptions = get_transcriptions_by_date_range(start_date, query_end)
     
     if not transcriptions:
         logger.warning(f"No transcriptions found for the date range {start_date.strftime('%Y%m%d')} to {end_date.strftime('%Y%m%d')}")
@@ -559,19 +699,20 @@ def summarize_day():
         return False
     
     # Create containing directory if it doesn't exist
-    output_dir = Path(output_path).parent
+    # Build the Path object once - it is reused for the timestamped copy below
+    output_file = Path(output_path)
+    output_dir = output_file.parent
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Prepare output format
     output_format = config.get("output", {})
     date_format = output_format.get("date_format", "%Y-%m-%d")
     
-    # Sort transcriptions by created_at in ascending order
-    sorted_transcriptions = sorted(
-        transcriptions, 
-        key=lambda x: x['created_at'] if x.get('created_at') else datetime.min
-    )
-    
+    # Rows arrive sorted by created_at ascending straight from the query,
+    # so no client-side re-sort is needed
+    sorted_transcriptions = transcriptions
+
+
     # Process with OpenAI Assistant
     logger.info("Processing transcriptions with OpenAI Assistant")
     openai_config = load_openai_config()
@@ -585,18 +726,17 @@ def summarize_day():
         prompt_name, prompt_template = get_prompt_by_name(prompts, "summarize_prompt")
         
         # Process with OpenAI Assistant
-        summarized_content = process_with_openai_assistant(sorted_transcriptions, prompt_template, openai_config, prompts)
+        summarized_content = process_with_openai_assistant(sorted_transcriptions, prompt_template, openai_config, prompts, config)
         
         # Prepare the final content with header
-        final_content = ""
         # Handle single day vs date range in header
         if start_date.date() == end_date.date():
-            final_content = f"=== Diary Summary: {start_date.strftime(date_format)} ===\n\n"
+            header = f"=== Diary Summary: {start_date.strftime(date_format)} ===\n\n"
         else:
-            final_content = f"=== Diary Summary: {start_date.strftime(date_format)} to {end_date.strftime(date_format)} ===\n\n"
-        
-        # Add the summarized content
-        final_content += summarized_content
+            header = f"=== Diary Summary: {start_date.strftime(date_format)} to {end_date.strftime(date_format)} ===\n\n"
+
+        # Join header and body in one allocation instead of growing a string
+        final_content = "".join((header, summarized_content))
     except ValueError as e:
         logger.error(f"Configuration error: {str(e)}")
         return False
@@ -610,14 +750,19 @@ def summarize_day():
         timestamp_prefix = datetime.now().strftime("%Y%m%d_%H%M%S_")
         
         # Create the output path with timestamp prefix
-        output_path_with_timestamp = str(Path(output_path).parent / f"{timestamp_prefix}{Path(output_path).name}")
+        output_path_with_timestamp = str(output_dir / f"{timestamp_prefix}{output_file.name}")
         
         with open(output_path_with_timestamp, 'w', encoding='utf-8') as f:
             f.write(final_content)
-        
-        # Also write to the original path to maintain existing functionality
-        with open(output_path, 'w', encoding='utf-8') as f:
+
+        # Also write to the original path to maintain existing functionality.
+        # The stable path is read by other components (scheduler, email), so
+        # write a sibling temp file and rename it into place atomically -
+        # readers never see a partially written summary.
+        tmp_path = output_file.with_suffix(output_file.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(final_content)
+        os.replace(tmp_path, output_path)
         
         logger.info(f"Successfully wrote summarized content to {output_path}")
         logger.info(f"Also wrote timestamped copy to {output_path_with_timestamp}")
@@ -633,8 +778,10 @@ def summarize_day():
         
         if not db_save_success:
             logger.warning("Failed to save summary to database, but file was written successfully")
-        
-        return True
+
+        # Return the summary content itself so callers don't have to re-read
+        # the output file or query the database for what we just produced
+        return final_content
     
     except Exception as e:
         logger.error(f"Error writing to output file: {str(e)}")
@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 
 # Add the parent directory to sys.path to make the module importable
 script_dir = Path(__file__).resolve().parent
-sys.path.insert(0, str(script_dir.parent.parent.parent))
+_src_root = str(script_dir.parent.parent.parent)
+if _src_root not in sys.path:
+    sys.path.insert(0, _src_root)
 
 # Import the module
 from voice_diary.agent_summarize_day.agent_summarize_day import summarize_day
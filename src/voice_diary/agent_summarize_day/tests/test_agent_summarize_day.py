@@ -99,6 +99,7 @@ class TestAgentSummarizeDay(unittest.TestCase):
             }
         ]
 
+    @patch("voice_diary.agent_summarize_day.agent_summarize_day.orjson", None)
     @patch("voice_diary.agent_summarize_day.agent_summarize_day.CONFIG_PATH")
     @patch("builtins.open", new_callable=mock_open)
     @patch("json.load")
@@ -116,6 +117,7 @@ class TestAgentSummarizeDay(unittest.TestCase):
         mock_file.assert_called_once()
         mock_json_load.assert_called_once()
 
+    @patch("voice_diary.agent_summarize_day.agent_summarize_day.orjson", None)
     @patch("voice_diary.agent_summarize_day.agent_summarize_day.OPENAI_CONFIG_PATH")
     @patch("builtins.open", new_callable=mock_open)
     @patch("json.load")
@@ -135,7 +137,7 @@ class TestAgentSummarizeDay(unittest.TestCase):
 
     @patch("voice_diary.agent_summarize_day.agent_summarize_day.PROMPTS_PATH")
     @patch("builtins.open", new_callable=mock_open)
-    @patch("yaml.safe_load")
+    @patch("yaml.load")
     def test_load_prompts(self, mock_yaml_load, mock_file, mock_prompts_path):
         """Test loading prompts from a YAML file."""
         # Setup mock
@@ -151,7 +151,7 @@ class TestOpenAIIntegration(unittest.TestCase):
         
         # Assertions
         self.assertEqual(result, "Test summarized content")
-        mock_format_llm.assert_called_once_with(self.test_transcriptions)
+        mock_format_llm.assert_called_once_with(self.test_transcriptions, None)
         mock_client.beta.assistants.create.assert_called_once()
         mock_client.beta.threads.create.assert_called_once()
         mock_client.beta.threads.messages.create.assert_called_once()
@@ -243,8 +243,9 @@ class TestOpenAIIntegration(unittest.TestCase):
         
         # Assertions
         self.assertEqual(result, "Test summarized content")
-        mock_format_llm.assert_called_once_with(self.test_transcriptions)
-        mock_client.beta.assistants.retrieve.assert_called_once_with("test_assistant_id")
+        mock_format_llm.assert_called_once_with(self.test_transcriptions, None)
+        # The stored assistant_id is trusted without a verification round-trip
+        mock_client.beta.assistants.retrieve.assert_not_called()
         mock_client.beta.threads.retrieve.assert_called_once_with("test_thread_id")
         mock_client.beta.threads.messages.create.assert_called_once()
         mock_client.beta.threads.runs.create.assert_called_once()
@@ -309,8 +310,9 @@ class TestOpenAIIntegration(unittest.TestCase):
         
         # Assertions
         self.assertIsNone(result)  # Should return None on failure
-        mock_format_llm.assert_called_once_with(self.test_transcriptions)
-        mock_client.beta.assistants.retrieve.assert_called_once_with("test_assistant_id")
+        mock_format_llm.assert_called_once_with(self.test_transcriptions, None)
+        # The stored assistant_id is trusted without a verification round-trip
+        mock_client.beta.assistants.retrieve.assert_not_called()
         mock_client.beta.threads.retrieve.assert_called_once_with("test_thread_id")
         mock_client.beta.threads.messages.create.assert_called_once()
         mock_client.beta.threads.runs.create.assert_called_once()
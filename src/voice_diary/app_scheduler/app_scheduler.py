@@ -10,11 +10,16 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import shutil
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import voice diary components
 from voice_diary.dwnload_files.dwnload_files import main as dwnload_files_main
 from voice_diary.transcribe_raw_audio.transcribe_raw_audio import run_transcribe
 from voice_diary.agent_summarize_day.agent_summarize_day import summarize_day
-from voice_diary.send_email.send_email import main as send_email_main
+from voice_diary.send_email.send_email import main as send_email_main, authenticate_gmail
 from voice_diary.file_utils.mv_files import process_files, load_config as load_mv_files_config, setup_logging as setup_mv_files_logging
 from voice_diary.db_utils.db_manager import get_latest_day_summaries, initialize_db
 
@@ -34,6 +39,12 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 CONFIG_DIR = PROJECT_ROOT / "project_modules_configs" / "config_app_scheduler"
 CONFIG_FILE = CONFIG_DIR / "app_scheduler_config.json"
 STATE_FILE = SCRIPT_DIR / 'pipeline_state.json'
+
+# Config paths for the other modules the scheduler drives - built once here
+# instead of on every task invocation
+MV_FILES_CONFIG_FILE = PROJECT_ROOT / "project_modules_configs" / "config_file_utils" / "file_utils_config.json"
+SUMMARY_CONFIG_FILE = PROJECT_ROOT / "project_modules_configs" / "config_agent_summarize_day" / "agent_summarize_day_config.json"
+SUMMARIZE_TRANSCRIPTIONS_CONFIG_FILE = PROJECT_ROOT / 'summarize_transcriptions' / 'config.json'
 LOG_DIR = SCRIPT_DIR / 'log'
 
 # Ensure log directory exists
@@ -43,15 +54,27 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 logger = logging.getLogger(__name__)
 
 # === Config Handling ===
+# Parsed config cached against the file's stat signature so the scheduler
+# loop doesn't re-read and re-parse an unchanged file on every tick
+_config_cache = None
+
 def load_config():
+    global _config_cache
+
     if not CONFIG_FILE.exists():
         print(f"Config file not found at: {CONFIG_FILE}")
         sys.exit(1)
     try:
+        st = os.stat(CONFIG_FILE)
+        file_sig = (st.st_mtime_ns, st.st_size)
+        if _config_cache is not None and _config_cache[0] == file_sig:
+            return _config_cache[1]
+
         with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
             config = json.load(f)
         if "scheduler" not in config:
             raise ValueError("Missing 'scheduler' section in config.json")
+        _config_cache = (file_sig, config)
         return config
     except Exception as e:
         print(f"Failed to load configuration: {e}")
@@ -73,14 +96,58 @@ def calculate_next_run_time(interval_seconds):
     return now + timedelta(seconds=interval_seconds)
 
 # === State Saving ===
+# Bytes of the last state written, so unchanged state skips the disk write
+_last_state_bytes = None
+
 def update_pipeline_state(state_file, updates):
+    global _last_state_bytes
+
     try:
-        with open(state_file, 'w') as f:
-            json.dump(updates, f, indent=2)
+        if orjson is not None:
+            new_bytes = orjson.dumps(updates, option=orjson.OPT_INDENT_2)
+        else:
+            new_bytes = json.dumps(updates, indent=2).encode('utf-8')
+        if new_bytes == _last_state_bytes:
+            return
+
+        # Write to a temp file and rename over the target so a crash
+        # mid-write can never leave a truncated state file behind
+        tmp_file = Path(str(state_file) + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(new_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, state_file)
+        _last_state_bytes = new_bytes
     except Exception as e:
         logger.error(f"Failed to update state file: {e}")
         raise
 
+# mv_files config and logger reused across pipeline ticks - reloading the
+# config and rebuilding the logger every run is wasted work while the
+# config file is unchanged
+_mv_files_context = None
+
+def _get_mv_files_context():
+    """Return (config, logger) for mv_files, cached on the config's stat."""
+    global _mv_files_context
+
+    mv_files_config_path = MV_FILES_CONFIG_FILE
+    try:
+        st = os.stat(mv_files_config_path)
+        file_sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_sig = None
+
+    if _mv_files_context is not None and file_sig is not None and _mv_files_context[0] == file_sig:
+        return _mv_files_context[1], _mv_files_context[2]
+
+    mv_files_config = load_mv_files_config(mv_files_config_path)
+    mv_files_logger = setup_mv_files_logging(mv_files_config)
+    if file_sig is not None:
+        _mv_files_context = (file_sig, mv_files_config, mv_files_logger)
+    return mv_files_config, mv_files_logger
+
 # === Main Pipeline Implementation ===
 def run_pipeline():
     """
@@ -102,23 +169,22 @@ def run_pipeline():
         
         # Step 1: Download files from Google Drive
         logger.info("Starting file download from Google Drive")
-        dwnload_files_main()
+        download_success = dwnload_files_main()
+        state["download_status"] = "success" if download_success else "failed"
         logger.info("Completed file download from Google Drive")
-        
+
         # Step 2: Transcribe downloaded audio files
         logger.info("Starting transcription of audio files")
-        run_transcribe()
+        transcribe_success = run_transcribe()
+        state["transcribe_status"] = "success" if transcribe_success else "failed"
         logger.info("Completed transcription of audio files")
         
         # Step 3: Move the downloaded files to appropriate directories
         # to prevent duplicate processing in future runs
         logger.info("Starting file organization to prevent duplication")
         try:
-            # Load mv_files configuration and set up its logger
-            mv_files_config_path = PROJECT_ROOT / "project_modules_configs" / "config_file_utils" / "file_utils_config.json"
-            mv_files_config = load_mv_files_config(mv_files_config_path)
-            mv_files_logger = setup_mv_files_logging(mv_files_config)
-            
+            mv_files_config, mv_files_logger = _get_mv_files_context()
+
             # Process and move the files
             files_processed, files_failed = process_files(mv_files_config, mv_files_logger)
             logger.info(f"File organization completed: {files_processed} files processed, {files_failed} files failed")
@@ -139,6 +205,16 @@ def run_pipeline():
     return state["last_run_status"] == "success"
 
 # === End of Day Task ===
+def _warm_gmail_auth():
+    """Authenticate with Gmail in the background so the token refresh is
+    already done by the time the summary email is sent. Failures are only
+    logged - the send path performs its own authentication anyway."""
+    try:
+        authenticate_gmail()
+        logger.debug("Gmail authentication warmed up")
+    except Exception as e:
+        logger.debug(f"Gmail auth warm-up failed (send path will retry): {e}")
+
 def run_end_of_day_task():
     """
     Run the end-of-day tasks:
@@ -146,35 +222,49 @@ def run_end_of_day_task():
     2. Send email with summary
     """
     try:
+        # Warm the Gmail OAuth exchange while the summary is generated -
+        # the two waits are independent, so the auth latency hides behind
+        # the much longer OpenAI call
+        auth_thread = threading.Thread(target=_warm_gmail_auth, daemon=True)
+        auth_thread.start()
+
         # Step 1: Generate summary
         logger.info("Starting daily summary generation")
         summary_success = summarize_day()
-        
+
         if summary_success:
             logger.info("Successfully generated daily summary")
-            
+
             summary_content = None
-            
-            # First try to get the summary from the database
-            try:
-                logger.info("Attempting to get summary from database")
-                initialize_db()
-                summaries = get_latest_day_summaries(limit=1)
-                
-                if summaries and len(summaries) > 0:
-                    latest_summary = summaries[0]
-                    summary_content = latest_summary.get('content', '')
-                    logger.info(f"Found latest summary in database from {latest_summary.get('summary_date')}")
-            except Exception as e:
-                logger.error(f"Error retrieving summary from database: {e}")
-                logger.error(traceback.format_exc())
+
+            # summarize_day returns the summary content itself on success,
+            # so normally there is no need to fetch it back from the
+            # database or re-read the file it just wrote
+            if isinstance(summary_success, str):
+                summary_content = summary_success
+                logger.info("Using summary content returned by summarize_day")
+
+            # Fallback: try to get the summary from the database
+            if summary_content is None:
+                try:
+                    logger.info("Attempting to get summary from database")
+                    initialize_db()
+                    summaries = get_latest_day_summaries(limit=1)
+
+                    if summaries and len(summaries) > 0:
+                        latest_summary = summaries[0]
+                        summary_content = latest_summary.get('content', '')
+                        logger.info(f"Found latest summary in database from {latest_summary.get('summary_date')}")
+                except Exception as e:
+                    logger.error(f"Error retrieving summary from database: {e}")
+                    logger.error(traceback.format_exc())
             
             # If database retrieval failed, try to read from file
             if not summary_content:
                 logger.info("No summary found in database, trying to read from file")
                 try:
                     # Load the summary config to get the file path - use correct file name
-                    summary_config_path = PROJECT_ROOT / "project_modules_configs" / "config_agent_summarize_day" / "agent_summarize_day_config.json"
+                    summary_config_path = SUMMARY_CONFIG_FILE
                     
                     if not os.path.exists(summary_config_path):
                         logger.error(f"Summary config file not found at: {summary_config_path}")
@@ -189,7 +279,8 @@ def run_end_of_day_task():
                     if summary_file_path and os.path.exists(summary_file_path):
                         # This is a file path, not a directory - read directly from it
                         logger.info(f"Reading summary from file: {summary_file_path}")
-                        with open(summary_file_path, 'r', encoding='utf-8') as f:
+                        # Large buffer so the whole summary comes in with few syscalls
+                        with open(summary_file_path, 'r', encoding='utf-8', buffering=1048576) as f:
                             summary_content = f.read()
                         logger.info(f"Successfully read summary content from file ({len(summary_content)} characters)")
                     else:
@@ -198,33 +289,18 @@ def run_end_of_day_task():
                     logger.error(f"Error reading summary from file: {e}")
                     logger.error(traceback.format_exc())
             
-            # If we have summary content, update the email config
+            # If we have summary content, send it directly
             if summary_content:
-                try:
-                    # Load the email config
-                    email_config_path = PROJECT_ROOT / "project_modules_configs" / "config_send_email" / "email_config.json"
-                    with open(email_config_path, 'r', encoding='utf-8') as f:
-                        email_config = json.load(f)
-                    
-                    # Update the email message with the summary content
-                    if 'email' in email_config:
-                        today = datetime.now().strftime("%Y-%m-%d")
-                        email_config['email']['message'] = f"Voice Diary Summary for {today}:\n\n{summary_content}"
-                        
-                        # Save the updated config
-                        with open(email_config_path, 'w', encoding='utf-8') as f:
-                            json.dump(email_config, f, indent=2)
-                        
-                        logger.info(f"Updated email message with summary content ({len(summary_content)} characters)")
-                    else:
-                        logger.warning("Email configuration doesn't contain 'email' section")
-                except Exception as e:
-                    logger.error(f"Error updating email config: {e}")
-                    logger.error(traceback.format_exc())
-                
-                # Step 2: Send email
-                logger.info("Starting email sending process")
-                send_email_main()
+                # Step 2: Send email - pass the summary in-process instead of
+                # rewriting email_config.json (send_email loads its config at
+                # import time, so a file rewrite never reached it anyway)
+                today = datetime.now().strftime("%Y-%m-%d")
+                email_message = f"Voice Diary Summary for {today}:\n\n{summary_content}"
+                logger.info(f"Starting email sending process ({len(summary_content)} characters)")
+                # Don't race a still-running warm-up; a finished (or failed)
+                # warm-up leaves the send path to authenticate as usual
+                auth_thread.join(timeout=60)
+                send_email_main(message=email_message)
                 logger.info("Completed email sending process")
             else:
                 logger.warning("No summary content found, skipping email")
@@ -281,7 +357,12 @@ def end_of_day_scheduler():
 # === Setup Logging ===
 def setup_logging():
     log_file = LOG_DIR / 'app_scheduler.log'
-    
+
+    # Already configured - adding handlers again would duplicate every log
+    # line written after a repeat call
+    if logger.handlers:
+        return
+
     # Create handlers
     console_handler = logging.StreamHandler()
     file_handler = logging.handlers.RotatingFileHandler(
@@ -337,14 +418,27 @@ def main():
             logger.info("Main pipeline: Running once and exiting")
             run_pipeline()
         else:
-            # Main loop for recurring execution
+            # Main loop for recurring execution. Ticks are anchored to
+            # start + k*interval rather than sleeping a full interval after
+            # each run, so pipeline runtime doesn't stretch the period and
+            # runs_per_day stays accurate over long uptimes.
             logger.info("Main pipeline: Running in continuous mode")
+            start = time.monotonic()
+            tick = 0
             while True:
                 logger.info("Starting main pipeline execution")
                 run_pipeline()
-                next_run = calculate_next_run_time(interval)
+                tick += 1
+                sleep_time = (start + tick * interval) - time.monotonic()
+                while sleep_time <= 0:
+                    # The run overran one or more whole intervals - skip the
+                    # missed ticks instead of firing back-to-back runs
+                    logger.warning("Pipeline run overran its interval; skipping a missed tick")
+                    tick += 1
+                    sleep_time = (start + tick * interval) - time.monotonic()
+                next_run = datetime.now() + timedelta(seconds=sleep_time)
                 logger.info(f"Next main pipeline run at: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                time.sleep(interval)
+                time.sleep(sleep_time)
 
     except KeyboardInterrupt:
         logger.info("Scheduler interrupted by user")
@@ -359,7 +453,7 @@ def ensure_env_file_exists():
     """
     try:
         # Get the source .env file path
-        src_env_path = Path(__file__).parent.parent / '.env'
+        src_env_path = PROJECT_ROOT / '.env'
         
         if src_env_path.exists():
             # Get the installed package location
@@ -403,19 +497,6 @@ def run_end_of_day_tasks():
             logger.error(traceback.format_exc())
             return
         
-        # Read the summary config
-        try:
-            summary_config_path = Path(__file__).parent.parent / 'summarize_transcriptions' / 'config.json'
-            if not summary_config_path.exists():
-                logger.error(f"Summary config file not found at: {summary_config_path}")
-                raise FileNotFoundError(f"Summary config file not found at: {summary_config_path}")
-                
-            with open(summary_config_path, 'r') as f:
-                summary_config = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading summary config: {e}")
-            return
-        
         # Read the latest summary file
         try:
             if summaries:
@@ -423,13 +504,27 @@ def run_end_of_day_tasks():
                 summary_content = summary.get('content', '')
                 logger.info(f"Latest summary content is {len(summary_content)} characters")
             else:
-                # No summary in DB, try to read from file
+                # No summary in DB - only now do we need the summary config
+                # to locate the fallback file on disk
+                try:
+                    summary_config_path = SUMMARIZE_TRANSCRIPTIONS_CONFIG_FILE
+                    if not summary_config_path.exists():
+                        logger.error(f"Summary config file not found at: {summary_config_path}")
+                        raise FileNotFoundError(f"Summary config file not found at: {summary_config_path}")
+
+                    with open(summary_config_path, 'r') as f:
+                        summary_config = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error loading summary config: {e}")
+                    return
+
                 summary_dir = Path(summary_config.get('summary_output_dir', '.'))
-                latest_summary_files = sorted(summary_dir.glob('*_summary.txt'), key=lambda x: x.stat().st_mtime, reverse=True)
-                
-                if latest_summary_files:
-                    latest_summary_file = latest_summary_files[0]
-                    with open(latest_summary_file, 'r') as f:
+                # Only the newest file is needed, so take the max by mtime
+                # in a single pass instead of sorting the whole listing
+                latest_summary_file = max(summary_dir.glob('*_summary.txt'), key=lambda x: x.stat().st_mtime, default=None)
+
+                if latest_summary_file:
+                    with open(latest_summary_file, 'r', buffering=1048576) as f:
                         summary_content = f.read()
                     logger.info(f"Read summary from file: {latest_summary_file}")
                 else:
@@ -7,30 +7,41 @@ import os
 from pathlib import Path
 
 # Import the module under test
+from voice_diary.app_scheduler import app_scheduler
 from voice_diary.app_scheduler.app_scheduler import update_pipeline_state
 
 class TestStateManagement(unittest.TestCase):
     """Tests for the state management functions."""
-    
+
+    def setUp(self):
+        # Reset the skip-if-unchanged snapshot so each test starts clean
+        app_scheduler._last_state_bytes = None
+
+    @patch('os.replace')
+    @patch('os.fsync')
     @patch('builtins.open', new_callable=mock_open)
-    @patch('json.dump')
-    def test_update_pipeline_state(self, mock_json_dump, mock_file):
-        """Test updating the pipeline state file."""
+    def test_update_pipeline_state(self, mock_file, mock_fsync, mock_replace):
+        """Test updating the pipeline state file atomically."""
         test_state_file = "test_state.json"
         test_updates = {
             "last_run_time": "2023-07-15T12:00:00.000000",
             "last_run_status": "success"
         }
-        
+
         # Call the function
         update_pipeline_state(test_state_file, test_updates)
-        
-        # Verify file was opened correctly
-        mock_file.assert_called_once_with(test_state_file, 'w')
-        
-        # Verify json.dump was called with the correct parameters
+
+        # Verify the temp file was written and renamed over the target
+        mock_file.assert_called_once_with(Path(test_state_file + '.tmp'), 'wb')
         file_handle = mock_file()
-        mock_json_dump.assert_called_once_with(test_updates, file_handle, indent=2)
+        file_handle.write.assert_called_once_with(
+            json.dumps(test_updates, indent=2).encode('utf-8'))
+        mock_replace.assert_called_once_with(
+            Path(test_state_file + '.tmp'), test_state_file)
+
+        # A second call with identical state skips the write entirely
+        update_pipeline_state(test_state_file, test_updates)
+        mock_replace.assert_called_once()
     
     @patch('builtins.open')
     @patch('voice_diary.app_scheduler.app_scheduler.logger')
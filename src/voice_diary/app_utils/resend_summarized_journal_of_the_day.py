@@ -13,6 +13,11 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import voice diary components
 from voice_diary.db_utils.db_manager import get_day_summaries_by_date_range, initialize_db
 from voice_diary.send_email.send_email import main as send_email_main
@@ -31,16 +36,19 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 # Configuration paths - explicitly define all path components
 CONFIG_DIR = PROJECT_ROOT / "project_modules_configs" / "config_app_utils"
 CONFIG_PATH = CONFIG_DIR / "app_utils_config.json"
-EMAIL_CONFIG_DIR = PROJECT_ROOT / "project_modules_configs" / "config_send_email"
-EMAIL_CONFIG_PATH = EMAIL_CONFIG_DIR / "email_config.json"
 
 # Initialize logger
 logger = logging.getLogger("resend_summary")
 
 def setup_logging():
     """Setup logging configuration"""
+    # Already configured - avoid stacking duplicate handlers when called
+    # more than once in the same process
+    if logger.handlers:
+        return
+
     logger.setLevel(logging.INFO)
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
@@ -48,21 +56,33 @@ def setup_logging():
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
 
+# Parsed config cache keyed by (path, st_mtime_ns) so repeated scheduler
+# invocations in the same process skip re-reading an unchanged file
+_config_cache = {}
+
 def load_config():
     """Load configuration from JSON file"""
     try:
         logger.info(f"Attempting to load config from: {CONFIG_PATH}")
-        
+
         # Check if config file exists
         if not CONFIG_PATH.exists():
             logger.error(f"Config file not found at: {CONFIG_PATH}")
             logger.error(f"Directory exists: {CONFIG_DIR.exists()}")
             logger.error(f"Directory contents: {list(CONFIG_DIR.glob('*'))}")
             sys.exit(1)
-            
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+
+        cache_key = (str(CONFIG_PATH), os.stat(CONFIG_PATH).st_mtime_ns)
+        if cache_key in _config_cache:
+            return _config_cache[cache_key]
+
+        with open(CONFIG_PATH, 'rb') as f:
+            if orjson is not None:
+                config = orjson.loads(f.read())
+            else:
+                config = json.load(f)
             logger.info(f"Successfully loaded config: {CONFIG_PATH}")
+            _config_cache[cache_key] = config
             return config
     except Exception as e:
         logger.error(f"Error loading configuration: {str(e)}")
@@ -115,51 +135,14 @@ def get_date_range_from_config(config):
         
         return start_date, end_date
 
-def update_email_config(summary_content, start_date, end_date):
-    """Update email config with summary content"""
-    try:
-        # Check if email config path exists
-        logger.info(f"Attempting to read email config from: {EMAIL_CONFIG_PATH}")
-        
-        if not EMAIL_CONFIG_PATH.exists():
-            logger.error(f"Email config file not found at: {EMAIL_CONFIG_PATH}")
-            logger.error(f"Directory exists: {EMAIL_CONFIG_DIR.exists()}")
-            logger.error(f"Directory contents: {list(EMAIL_CONFIG_DIR.glob('*'))}")
-            return False
-            
-        # Load the email config
-        with open(EMAIL_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            email_config = json.load(f)
-        
-        # Update the email message with the summary content
-        if 'email' in email_config:
-            # Format date for email subject
-            if start_date.date() == end_date.date():
-                date_str = start_date.strftime("%Y-%m-%d")
-                email_config['email']['subject'] = f"Voice Diary Summary for {date_str}"
-            else:
-                start_str = start_date.strftime("%Y-%m-%d")
-                end_str = end_date.strftime("%Y-%m-%d")
-                email_config['email']['subject'] = f"Voice Diary Summary from {start_str} to {end_str}"
-            
-            # Set the message content
-            email_config['email']['message'] = summary_content
-            
-            # Make sure email sending is enabled
-            email_config['send_email'] = True
-            
-            # Save the updated config
-            with open(EMAIL_CONFIG_PATH, 'w', encoding='utf-8') as f:
-                json.dump(email_config, f, indent=2)
-            
-            logger.info("Updated email configuration with summary content")
-            return True
-        else:
-            logger.error("Email configuration doesn't contain 'email' section")
-            return False
-    except Exception as e:
-        logger.error(f"Error updating email config: {str(e)}")
-        return False
+def build_email_subject(start_date, end_date):
+    """Build the email subject line for the given date range"""
+    if start_date.date() == end_date.date():
+        date_str = start_date.strftime("%Y-%m-%d")
+        return f"Voice Diary Summary for {date_str}"
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+    return f"Voice Diary Summary from {start_str} to {end_str}"
 
 def main():
     """Main function to resend summary"""
@@ -190,16 +173,15 @@ def main():
         summary_content = summary.get('content', '')
         logger.info(f"Found summary from {summary.get('summary_date')}")
         
-        # Update email config with summary content
-        if update_email_config(summary_content, start_date, end_date):
-            # Send email
-            logger.info("Sending email with summary")
-            send_email_main()
-            logger.info("Email sent successfully")
-            return True
-        else:
-            logger.error("Failed to update email configuration")
-            return False
+        # Send email - hand the summary to send_email in-process instead of
+        # round-tripping it through email_config.json on disk
+        logger.info("Sending email with summary")
+        send_email_main(
+            message=summary_content,
+            subject=build_email_subject(start_date, end_date)
+        )
+        logger.info("Email sent successfully")
+        return True
     else:
         logger.warning(f"No summary found for the date range")
         return False
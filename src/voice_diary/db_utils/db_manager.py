@@ -1,40 +1,57 @@
+import atexit
 import logging
+import time
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, register_default_jsonb
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from voice_diary.db_utils.db_config import get_db_url
 
 # Ensure logging is configured
 logger = logging.getLogger(__name__)
 
+# Decode jsonb columns (transcription metadata) with orjson when available -
+# noticeably faster than stdlib json on result sets with many rows
+if orjson is not None:
+    register_default_jsonb(loads=orjson.loads, globally=True)
+
 # Connection pool for reusing database connections
 connection_pool = None
 
+# Short-lived cache for date-range transcription queries, keyed by
+# (start_date, end_date). Entries are (timestamp, results); the cache is
+# cleared whenever a new transcription is saved.
+_transcriptions_cache = {}
+_TRANSCRIPTIONS_CACHE_TTL = 300  # seconds
+
 def initialize_db():
     """Initialize database and create necessary tables if they don't exist"""
     global connection_pool
 
+    # Already initialized - the scheduler calls this every pipeline tick,
+    # and reconnecting plus re-running the DDL each time is pure overhead
+    if connection_pool is not None:
+        return True
+
     try:
         # Initialize connection pool
         db_url = get_db_url()
-        logger.info(f"Initializing database with connection URL: {db_url}")
-        
-        # Test connection before creating pool
-        logger.info("Testing direct database connection...")
-        try:
-            test_conn = psycopg2.connect(db_url)
-            logger.info("Direct connection test successful")
-            logger.info(f"PostgreSQL server version: {test_conn.server_version}")
-            test_conn.close()
-        except Exception as conn_error:
-            logger.error(f"Direct connection test failed: {str(conn_error)}")
-            return False
-        
-        # Create connection pool
+        logger.info("Initializing database with connection URL: %s", db_url)
+
+        # No separate probe connection beforehand - creating the pool opens
+        # a real connection anyway, so a broken URL fails here with the same
+        # error and we save one full connect round-trip per startup.
+        # Create connection pool - ThreadedConnectionPool because the
+        # scheduler hands out connections from multiple threads (main
+        # pipeline loop plus the end-of-day thread)
         logger.info("Creating connection pool...")
-        connection_pool = pool.SimpleConnectionPool(1, 10, db_url)
+        connection_pool = pool.ThreadedConnectionPool(1, 10, db_url)
         logger.info("Connection pool created successfully")
         
         # Create tables
@@ -42,19 +59,30 @@ def initialize_db():
         logger.info("Database initialized successfully")
         return True
     except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
+        logger.error("Failed to initialize database: %s", str(e))
         # Print more detailed traceback for debugging
         import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Traceback: %s", traceback.format_exc())
         return False
 
+# When initialization fails, don't retry the full connect (and its timeout)
+# on every call - back off for a short interval first
+_db_retry_after = 0.0
+_DB_RETRY_INTERVAL = 30  # seconds
+
 def get_connection():
     """Get a connection from the pool"""
-    global connection_pool
-    
+    global connection_pool, _db_retry_after
+
     if connection_pool is None:
-        initialize_db()
-    
+        if time.monotonic() < _db_retry_after:
+            logger.debug("Database marked unavailable, skipping reconnect attempt")
+            return None
+        if not initialize_db():
+            _db_retry_after = time.monotonic() + _DB_RETRY_INTERVAL
+            return None
+        _db_retry_after = 0.0
+
     return connection_pool.getconn()
 
 def return_connection(conn):
@@ -71,7 +99,8 @@ def create_tables():
         conn = get_connection()
         cur = conn.cursor()
         
-        # Create vd_transcriptions table
+        # All DDL in a single execute so schema setup is one server
+        # round-trip instead of four; every statement is idempotent
         cur.execute("""
         CREATE TABLE IF NOT EXISTS vd_transcriptions (
             id SERIAL PRIMARY KEY,
@@ -81,16 +110,10 @@ def create_tables():
             created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
             duration_seconds FLOAT,
             metadata JSONB
-        )
-        """)
-        
-        # Create index on transcriptions.created_at for faster date-based queries
-        cur.execute("""
-        CREATE INDEX IF NOT EXISTS idx_vd_transcriptions_created_at ON vd_transcriptions(created_at)
-        """)
-        
-        # Create vd_day_summaries table
-        cur.execute("""
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_vd_transcriptions_created_at ON vd_transcriptions(created_at);
+
         CREATE TABLE IF NOT EXISTS vd_day_summaries (
             id SERIAL PRIMARY KEY,
             content TEXT NOT NULL,
@@ -98,20 +121,17 @@ def create_tables():
             filename TEXT,
             date_range_start TIMESTAMP WITH TIME ZONE,
             date_range_end TIMESTAMP WITH TIME ZONE
-        )
-        """)
-        
-        # Create index on summary_date for faster queries
-        cur.execute("""
-        CREATE INDEX IF NOT EXISTS idx_vd_day_summaries_date ON vd_day_summaries(summary_date)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_vd_day_summaries_date ON vd_day_summaries(summary_date);
         """)
-        
+
         conn.commit()
         logger.info("Database tables created successfully")
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.error(f"Error creating tables: {str(e)}")
+        logger.error("Error creating tables: %s", str(e))
         raise
     finally:
         if conn:
@@ -146,11 +166,18 @@ def save_transcription(content, filename=None, audio_path=None, model_type=None,
         logger.info("Creating cursor for database operation...")
         cur = conn.cursor()
         
-        # Convert metadata to JSONB if provided
-        metadata_json = json.dumps(metadata) if metadata else None
+        # Convert metadata to JSONB if provided - orjson serializes straight
+        # to bytes and is several times faster than stdlib json
+        if metadata:
+            if orjson is not None:
+                metadata_json = orjson.dumps(metadata).decode('utf-8')
+            else:
+                metadata_json = json.dumps(metadata)
+        else:
+            metadata_json = None
         
         # Log what we're inserting
-        logger.info(f"Inserting transcription: filename={filename}, audio_path={audio_path}")
+        logger.info("Inserting transcription: filename=%s, audio_path=%s", filename, audio_path)
         
         # Insert transcription
         cur.execute("""
@@ -162,19 +189,21 @@ def save_transcription(content, filename=None, audio_path=None, model_type=None,
         
         transcription_id = cur.fetchone()[0]
         
-        logger.info(f"Committing transaction for transcription ID: {transcription_id}")
+        logger.info("Committing transaction for transcription ID: %s", transcription_id)
         conn.commit()
-        logger.info(f"Saved transcription with ID: {transcription_id}")
+        # New data invalidates any cached date-range query results
+        _transcriptions_cache.clear()
+        logger.info("Saved transcription with ID: %s", transcription_id)
         return transcription_id
         
     except Exception as e:
         if conn:
-            logger.error(f"Rolling back transaction due to error: {str(e)}")
+            logger.error("Rolling back transaction due to error: %s", str(e))
             conn.rollback()
-        logger.error(f"Error saving transcription: {str(e)}")
+        logger.error("Error saving transcription: %s", str(e))
         # Print more detailed traceback for debugging
         import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Traceback: %s", traceback.format_exc())
         return None
     finally:
         if conn:
@@ -197,7 +226,7 @@ def get_transcription(transcription_id):
         result = cur.fetchone()
         return result
     except Exception as e:
-        logger.error(f"Error retrieving transcription: {str(e)}")
+        logger.error("Error retrieving transcription: %s", str(e))
         return None
     finally:
         if conn:
@@ -220,30 +249,42 @@ def get_latest_transcriptions(limit=10):
         results = cur.fetchall()
         return results
     except Exception as e:
-        logger.error(f"Error retrieving latest transcriptions: {str(e)}")
+        logger.error("Error retrieving latest transcriptions: %s", str(e))
         return []
     finally:
         if conn:
             return_connection(conn)
 
 def get_transcriptions_by_date_range(start_date, end_date):
-    """Retrieve transcriptions within a date range"""
+    """Retrieve transcriptions within the half-open range [start_date, end_date)
+
+    Callers pass the midnight after the last wanted day as end_date, so a
+    full day is covered without resorting to 23:59:59 bounds that drop the
+    final second. Plain comparisons on created_at keep the predicate
+    index-friendly.
+    """
+    cache_key = (start_date, end_date)
+    cached = _transcriptions_cache.get(cache_key)
+    if cached is not None and (time.monotonic() - cached[0]) < _TRANSCRIPTIONS_CACHE_TTL:
+        return cached[1]
+
     conn = None
     try:
         conn = get_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
+
         cur.execute("""
         SELECT t.*
         FROM vd_transcriptions t
-        WHERE t.created_at BETWEEN %s AND %s
-        ORDER BY t.created_at DESC
+        WHERE t.created_at >= %s AND t.created_at < %s
+        ORDER BY t.created_at ASC
         """, (start_date, end_date))
-        
+
         results = cur.fetchall()
+        _transcriptions_cache[cache_key] = (time.monotonic(), results)
         return results
     except Exception as e:
-        logger.error(f"Error retrieving transcriptions by date range: {str(e)}")
+        logger.error("Error retrieving transcriptions by date range: %s", str(e))
         return []
     finally:
         if conn:
@@ -258,6 +299,9 @@ def close_all_connections():
         connection_pool = None
         logger.info("All database connections closed")
 
+# Make sure pooled connections are released when the process exits
+atexit.register(close_all_connections)
+
 def save_day_summary(content, start_date=None, end_date=None, filename=None):
     """
     Save a day summary to the database
@@ -289,13 +333,13 @@ def save_day_summary(content, start_date=None, end_date=None, filename=None):
         summary_id = cur.fetchone()[0]
         
         conn.commit()
-        logger.info(f"Saved day summary with ID: {summary_id}")
+        logger.info("Saved day summary with ID: %s", summary_id)
         return summary_id
         
     except Exception as e:
         if conn:
             conn.rollback()
-        logger.error(f"Error saving day summary: {str(e)}")
+        logger.error("Error saving day summary: %s", str(e))
         return None
     finally:
         if conn:
@@ -329,7 +373,7 @@ def get_day_summaries_by_date_range(start_date, end_date, limit=10):
         results = cur.fetchall()
         return results
     except Exception as e:
-        logger.error(f"Error retrieving day summaries by date range: {str(e)}")
+        logger.error("Error retrieving day summaries by date range: %s", str(e))
         return []
     finally:
         if conn:
@@ -360,12 +404,45 @@ def get_latest_day_summaries(limit=5):
         results = cur.fetchall()
         return results
     except Exception as e:
-        logger.error(f"Error retrieving latest day summaries: {str(e)}")
+        logger.error("Error retrieving latest day summaries: %s", str(e))
         return []
     finally:
         if conn:
             return_connection(conn)
 
+def get_summary_by_date_range(start_date, end_date):
+    """
+    Retrieve the stored summary content for an exact date range
+
+    Args:
+        start_date (datetime): Start date the summary was saved with
+        end_date (datetime): End date the summary was saved with
+
+    Returns:
+        str: Content of the most recent matching summary, or None if none exists
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        cur = conn.cursor()
+
+        cur.execute("""
+        SELECT content
+        FROM vd_day_summaries
+        WHERE date_range_start = %s AND date_range_end = %s
+        ORDER BY summary_date DESC
+        LIMIT 1
+        """, (start_date, end_date))
+
+        result = cur.fetchone()
+        return result[0] if result else None
+    except Exception as e:
+        logger.error("Error retrieving summary by date range: %s", str(e))
+        return None
+    finally:
+        if conn:
+            return_connection(conn)
+
 def check_summary_exists(start_date, end_date):
     """
     Check if a summary already exists for a specific date range
@@ -382,17 +459,19 @@ def check_summary_exists(start_date, end_date):
         conn = get_connection()
         cur = conn.cursor()
         
-        # Check for exact date range match
+        # Check for exact date range match - EXISTS lets the server stop at
+        # the first matching row instead of counting them all
         cur.execute("""
-        SELECT COUNT(*)
-        FROM vd_day_summaries
-        WHERE date_range_start = %s AND date_range_end = %s
+        SELECT EXISTS (
+            SELECT 1
+            FROM vd_day_summaries
+            WHERE date_range_start = %s AND date_range_end = %s
+        )
         """, (start_date, end_date))
-        
-        count = cur.fetchone()[0]
-        return count > 0
+
+        return cur.fetchone()[0]
     except Exception as e:
-        logger.error(f"Error checking for existing summaries: {str(e)}")
+        logger.error("Error checking for existing summaries: %s", str(e))
         return False
     finally:
         if conn:
@@ -6,6 +6,7 @@ This module provides functionality to move files from a source directory to vari
 target directories based on file extensions.
 """
 
+import errno
 import os
 import sys
 import json
@@ -117,32 +118,43 @@ def ensure_directories_exist(directories: List[Path]) -> None:
         directory.mkdir(parents=True, exist_ok=True)
 
 
+def build_extension_type_map(gdrive_config: Dict, local_config: Dict) -> Dict[str, str]:
+    """
+    Build a lookup table mapping lowercased extensions to their file type.
+
+    Args:
+        gdrive_config: Google Drive configuration dictionary with extension lists
+        local_config: Local configuration dictionary with enabled flags
+
+    Returns:
+        Dictionary mapping extensions (e.g. '.mp3') to 'audio', 'image' or 'video'
+    """
+    extension_map: Dict[str, str] = {}
+
+    # Insertion order mirrors the old audio/image/video precedence; setdefault
+    # keeps the first category that claims an extension
+    for file_type in ('audio', 'image', 'video'):
+        type_key = f'{file_type}_file_types'
+        if local_config[type_key]['enabled']:
+            for extension in gdrive_config[type_key]['include']:
+                extension_map.setdefault(extension.lower(), file_type)
+
+    return extension_map
+
+
 def get_file_type(file_path: Path, gdrive_config: Dict, local_config: Dict) -> Optional[str]:
     """
     Determine the type of file based on its extension using Google Drive config.
-    
+
     Args:
         file_path: Path to the file
         gdrive_config: Google Drive configuration dictionary
         local_config: Local configuration dictionary with enabled flags
-        
+
     Returns:
         String indicating file type ('audio', 'image', 'video') or None if no match
     """
-    extension = file_path.suffix.lower()
-    
-    # Check each file type category using only the local config enabled flag
-    if (local_config['audio_file_types']['enabled'] and 
-        extension in gdrive_config['audio_file_types']['include']):
-        return 'audio'
-    elif (local_config['image_file_types']['enabled'] and 
-          extension in gdrive_config['image_file_types']['include']):
-        return 'image'
-    elif (local_config['video_file_types']['enabled'] and 
-          extension in gdrive_config['video_file_types']['include']):
-        return 'video'
-    
-    return None
+    return build_extension_type_map(gdrive_config, local_config).get(file_path.suffix.lower())
 
 
 def move_file(file_path: Path, destination_dir: Path, logger: logging.Logger, 
@@ -179,7 +191,15 @@ def move_file(file_path: Path, destination_dir: Path, logger: logging.Logger,
         
         # If delete_source is True, move the file; otherwise, copy it
         if delete_source:
-            shutil.move(str(file_path), str(destination_path))
+            try:
+                # Same-filesystem move is a single rename syscall
+                os.replace(str(file_path), str(destination_path))
+            except OSError as move_error:
+                if move_error.errno != errno.EXDEV:
+                    raise
+                # Destination lives on a different filesystem - fall back to
+                # shutil.move's copy+unlink
+                shutil.move(str(file_path), str(destination_path))
             logger.info(f"Moved {file_path} to {destination_path}")
         else:
             shutil.copy2(str(file_path), str(destination_path))
@@ -229,31 +249,35 @@ def process_files(config: Dict, logger: logging.Logger) -> Tuple[int, int]:
     
     # Get delete_source setting
     delete_source = config['processing'].get('delete_source_after_move', False)
-    
+
+    # Build the extension lookup once instead of scanning the config lists
+    # for every file in the source directory
+    extension_map = build_extension_type_map(gdrive_config, config)
+    target_dirs = {'audio': audio_dir, 'image': image_dir, 'video': video_dir}
+
     # Track statistics
     files_processed = 0
     files_failed = 0
-    
-    # Process each file in the source directory
+
+    # Process each file in the source directory - os.scandir reuses the
+    # stat data from the directory listing, so is_file() costs no extra syscall
     if source_dir.exists() and source_dir.is_dir():
-        for file_path in source_dir.iterdir():
-            if file_path.is_file():
-                file_type = get_file_type(file_path, gdrive_config, config)
-                
-                if file_type == 'audio':
-                    success = move_file(file_path, audio_dir, logger, delete_source)
-                elif file_type == 'image':
-                    success = move_file(file_path, image_dir, logger, delete_source)
-                elif file_type == 'video':
-                    success = move_file(file_path, video_dir, logger, delete_source)
-                else:
-                    logger.info(f"Skipping {file_path} - not a recognized file type")
-                    success = True  # Not a failure, just not processed
-                
-                if success and file_type is not None:
-                    files_processed += 1
-                elif not success:
-                    files_failed += 1
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_path = Path(entry.path)
+                    file_type = extension_map.get(file_path.suffix.lower())
+
+                    if file_type is not None:
+                        success = move_file(file_path, target_dirs[file_type], logger, delete_source)
+                    else:
+                        logger.info(f"Skipping {file_path} - not a recognized file type")
+                        success = True  # Not a failure, just not processed
+
+                    if success and file_type is not None:
+                        files_processed += 1
+                    elif not success:
+                        files_failed += 1
     else:
         logger.error(f"Source directory {source_dir} does not exist or is not a directory")
     
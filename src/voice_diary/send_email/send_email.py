@@ -131,12 +131,14 @@ logger.addHandler(file_handler)
 logger.info("Voice Diary Email Service")
 logger.info(f"Logging to {log_path}")
 
+# Basic RFC 5322 compliant email regex pattern - compiled once at import
+EMAIL_PATTERN = re.compile(
+    r"^[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+)
+
 def validate_email_format(email):
     """Validate email address format using regex with additional domain duplication check"""
-    # Basic RFC 5322 compliant email regex pattern
-    pattern = r"^[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
-    
-    if not re.match(pattern, email):
+    if not EMAIL_PATTERN.match(email):
         return False
     
     # Additional checks for common mistakes
@@ -261,8 +263,42 @@ def check_credentials_file():
         return False
     return True
 
+# Cached Gmail service and its credentials - authentication does disk I/O,
+# an OAuth refresh and an HTTP discovery fetch, so pay for it once per
+# process instead of once per send
+_gmail_service = None
+_gmail_creds = None
+
+# Parsed token pickle keyed by (path, st_mtime_ns) - skips re-reading and
+# unpickling an unchanged token file on repeated authentications
+_token_cache = None
+
+def _load_token_creds(token_file):
+    """Load OAuth credentials from the token pickle, cached on file mtime."""
+    global _token_cache
+
+    try:
+        cache_key = (str(token_file), os.stat(token_file).st_mtime_ns)
+    except OSError:
+        cache_key = None
+
+    if cache_key is not None and _token_cache is not None and _token_cache[0] == cache_key:
+        return _token_cache[1]
+
+    with open(token_file, 'rb') as token:
+        creds = pickle.load(token)
+
+    if cache_key is not None:
+        _token_cache = (cache_key, creds)
+    return creds
+
 def authenticate_gmail():
     """Authenticate with Gmail API using OAuth."""
+    global _gmail_service, _gmail_creds
+
+    if _gmail_service is not None and _gmail_creds is not None and _gmail_creds.valid:
+        return _gmail_service
+
     try:
         credentials_file, token_file = get_credentials_paths(CONFIG)
         logger.info(f"Using credentials from: {credentials_file}")
@@ -273,8 +309,7 @@ def authenticate_gmail():
         # The token file stores the user's access and refresh tokens
         if token_file.exists():
             logger.info(f"Found existing token file")
-            with open(token_file, 'rb') as token:
-                creds = pickle.load(token)
+            creds = _load_token_creds(token_file)
                 
         # If no valid credentials are available, let the user log in
         if not creds or not creds.valid:
@@ -297,8 +332,11 @@ def authenticate_gmail():
             with open(token_file, 'wb') as token:
                 pickle.dump(creds, token)
         
-        # Build the service with the credentials
-        service = build('gmail', 'v1', credentials=creds)
+        # Build the service with the credentials; cache_discovery=False skips
+        # the discovery-document round-trip on every build
+        service = build('gmail', 'v1', credentials=creds, cache_discovery=False)
+        _gmail_creds = creds
+        _gmail_service = service
         return service
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
@@ -380,20 +418,38 @@ def restore_default_message():
     except Exception as e:
         logger.error(f"Error restoring default email message: {str(e)}")
 
-def main():
-    """Main function to send email via Gmail API."""
+def main(message=None, subject=None):
+    """Main function to send email via Gmail API.
+
+    Args:
+        message: Optional message body overriding the configured one. Passing
+            the content directly avoids rewriting email_config.json on disk
+            (which this module only reads at import time anyway).
+        subject: Optional subject line overriding the configured one.
+    """
     if not check_credentials_file():
         return
-    
+
     try:
         # Load email configuration
         email_config, config = load_email_config()
-        
+
         # Exit if email sending is disabled
         if not email_config:
             logger.info("Email sending is disabled in config. Exiting.")
             return
-        
+
+        # Apply in-process overrides without touching the config file.
+        # Remember whether the body came from the config - that decides
+        # whether the default message gets restored after sending.
+        message_from_config = message is None
+        if message is not None:
+            email_config = dict(email_config)
+            email_config['message'] = message
+        if subject is not None:
+            email_config = dict(email_config)
+            email_config['subject'] = subject
+
         # Authenticate with Gmail
         logger.info("Authenticating with Gmail...")
         service = authenticate_gmail()
@@ -413,7 +469,7 @@ def main():
         # Create the email
         if has_attachment and attachment_path:
             logger.info(f"Creating email with attachment: {attachment_path}")
-            message = create_message_with_attachment(
+            email_message = create_message_with_attachment(
                 sender,
                 email_config['to'],
                 email_config['subject'],
@@ -422,7 +478,7 @@ def main():
             )
         else:
             logger.info("Creating plain email message")
-            message = create_message(
+            email_message = create_message(
                 sender,
                 email_config['to'],
                 email_config['subject'],
@@ -431,12 +487,14 @@ def main():
         
         # Send the email
         logger.info(f"Sending email to: {email_config['to']}")
-        result = send_message(service, 'me', message)
+        result = send_message(service, 'me', email_message)
         
         if result:
             logger.info("Email sent successfully!")
-            # Restore default message after successful email sending
-            restore_default_message()
+            # Restore default message after successful email sending - only
+            # needed when the message came from the config file itself
+            if message_from_config:
+                restore_default_message()
         else:
             logger.error("Failed to send email.")
             
@@ -84,7 +84,7 @@ class TestErrorHandling(unittest.TestCase):
         
         # Assertions
         self.assertFalse(result)
-        mock_logger.error.assert_called_once()
+        mock_logger.exception.assert_called_once()
 
     @patch('voice_diary.transcribe_raw_audio.transcribe_raw_audio.logger')
     def test_process_audio_files_empty_list(self, mock_logger):
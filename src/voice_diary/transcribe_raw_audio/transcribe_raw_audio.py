@@ -19,8 +19,10 @@ from pathlib import Path
 import traceback
 import subprocess
 import logging.handlers
+import random
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 from voice_diary.db_utils.db_manager import save_transcription as db_save_transcription, initialize_db
 
@@ -36,6 +38,9 @@ else:
 # Project root for path calculations
 PROJECT_ROOT = SCRIPT_DIR.parent
 
+# Compiled once at import - matches YYYYMMDD_HHMMSS timestamps in filenames
+TIMESTAMP_PATTERN = re.compile(r'(\d{8}_\d{6})')
+
 # Define log directory
 LOGS_DIR = SCRIPT_DIR / "logs"
 
@@ -102,59 +107,96 @@ backup_count = logging_config.get("backup_count", 3)
 logger = logging.getLogger("voice_diary.transcribe")
 logger.setLevel(log_level)
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter(log_format))
-logger.addHandler(console_handler)
-
-# File handler with rotation
+# Only attach handlers on first import - re-importing (or the scheduler
+# importing this module again) must not stack duplicate handlers
 log_path = LOGS_DIR / log_file
-file_handler = logging.handlers.RotatingFileHandler(
-    log_path, maxBytes=max_size, backupCount=backup_count
-)
-file_handler.setFormatter(logging.Formatter(log_format))
-logger.addHandler(file_handler)
+if not logger.handlers:
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(log_format))
+    logger.addHandler(console_handler)
+
+    # File handler with rotation - opened lazily on first record
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=max_size, backupCount=backup_count, delay=True
+    )
+    file_handler.setFormatter(logging.Formatter(log_format))
+    logger.addHandler(file_handler)
 
 # Log initial information
 logger.info("Voice Diary Transcription Service")
 logger.info(f"Logging to {log_path}")
 
 
+# Cached OpenAI client and the API key it was built with - reusing the
+# client keeps its HTTP connection pool (and TLS session) alive across
+# transcription runs instead of paying a handshake per run
+_openai_client = None
+_openai_client_key = None
+
+
 def get_openai_client():
-    """Get the OpenAI client."""
+    """Get the OpenAI client, or None if it cannot be created."""
+    global _openai_client, _openai_client_key
     try:
         # Get the API key from environment variable
         api_key = os.environ.get("OPENAI_API_KEY")
-        
+
         if not api_key:
             logger.error("OPENAI_API_KEY environment variable not set")
             logger.error("Please set the OPENAI_API_KEY environment variable with your OpenAI API key")
-            sys.exit(1)
-            
+            return None
+
+        if _openai_client is not None and _openai_client_key == api_key:
+            return _openai_client
+
         # Create OpenAI client
         client = OpenAI(api_key=api_key)
+        _openai_client = client
+        _openai_client_key = api_key
         logger.info("OpenAI client initialized")
         return client
-        
+
     except Exception as e:
-        logger.error(f"Error creating OpenAI client: {str(e)}")
-        traceback.print_exc()
-        sys.exit(1)
+        logger.exception("Error creating OpenAI client")
+        return None
+
+
+# Cache for the parsed Google Drive config, validated against the file's
+# mtime and size so edits are picked up without re-parsing on every call
+_gdrive_config_cache = None
+
+
+def _load_gdrive_config():
+    """Load (and cache) the Google Drive download config shared with dwnload_files."""
+    global _gdrive_config_cache
+
+    gdrive_config_path = PROJECT_ROOT / "project_modules_configs" / "config_dwnload_files" / "dwnload_from_gdrive_conf.json"
+
+    if not gdrive_config_path.exists():
+        logger.error(f"Google Drive configuration file not found at {gdrive_config_path}")
+        return None
+
+    stat_result = gdrive_config_path.stat()
+    file_state = (stat_result.st_mtime_ns, stat_result.st_size)
+
+    if _gdrive_config_cache is not None and _gdrive_config_cache[0] == file_state:
+        return _gdrive_config_cache[1]
+
+    with open(gdrive_config_path, 'r') as f:
+        gdrive_config = json.load(f)
+
+    _gdrive_config_cache = (file_state, gdrive_config)
+    return gdrive_config
 
 
 def get_audio_extensions_from_gdrive_config():
     """Get audio file extensions from Google Drive config."""
     try:
-        # Load Google Drive configuration
-        gdrive_config_path = PROJECT_ROOT / "project_modules_configs" / "config_dwnload_files" / "dwnload_from_gdrive_conf.json"
-        
-        if not gdrive_config_path.exists():
-            logger.error(f"Google Drive configuration file not found at {gdrive_config_path}")
+        gdrive_config = _load_gdrive_config()
+        if gdrive_config is None:
             return None
-            
-        with open(gdrive_config_path, 'r') as f:
-            gdrive_config = json.load(f)
-            
+
         # Get audio file extensions
         audio_extensions = gdrive_config.get("audio_file_types", {}).get("include", [])
         
@@ -170,16 +212,10 @@ def get_audio_extensions_from_gdrive_config():
 def get_downloads_dir_from_gdrive_config():
     """Get downloads directory from Google Drive config."""
     try:
-        # Load Google Drive configuration
-        gdrive_config_path = PROJECT_ROOT / "project_modules_configs" / "config_dwnload_files" / "dwnload_from_gdrive_conf.json"
-        
-        if not gdrive_config_path.exists():
-            logger.error(f"Google Drive configuration file not found at {gdrive_config_path}")
+        gdrive_config = _load_gdrive_config()
+        if gdrive_config is None:
             return None
-            
-        with open(gdrive_config_path, 'r') as f:
-            gdrive_config = json.load(f)
-            
+
         # Get downloads directory
         downloads_dir = gdrive_config.get("downloads_path", {}).get("downloads_dir")
         
@@ -203,11 +239,12 @@ def calculate_duration(file_path):
                 "-show_entries", "format=duration", 
                 "-of", "default=noprint_wrappers=1:nokey=1", 
                 file_path
-            ], 
-            capture_output=True, 
-            text=True
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30
         )
-        
+
         # Parse the output
         if result.returncode == 0 and result.stdout.strip():
             duration = float(result.stdout.strip())
@@ -215,6 +252,12 @@ def calculate_duration(file_path):
         else:
             logger.warning(f"Unable to determine audio duration: {result.stderr}")
             return None
+    except subprocess.TimeoutExpired:
+        # A wedged ffprobe (e.g. on a truncated file) would otherwise hang
+        # the whole pipeline; kill it and fall through to the size estimate
+        logger.warning(f"ffprobe timed out for {file_path}, estimating duration from file size")
+        file_size = os.path.getsize(file_path)
+        return (file_size / (3 * 1024 * 1024)) * 60  # Convert to seconds
     except Exception as e:
         logger.error(f"Error calculating audio duration: {str(e)}")
         # Fallback: use file size as a very rough estimate (3MB ≈ 1 minute)
@@ -228,16 +271,16 @@ def get_transcription_model():
     models = openai_config.get("models", {})
     default_model = openai_config.get("default_model", "whisper-1")
     
-    # Log available models
+    # Log available models and collect the enabled ones in a single pass
+    enabled_models = []
     logger.info(f"Configured transcription models:")
     for model_name, model_info in models.items():
-        status = "enabled" if model_info.get("enabled", False) else "disabled"
+        enabled = model_info.get("enabled", False)
+        if enabled:
+            enabled_models.append(model_name)
+        status = "enabled" if enabled else "disabled"
         logger.info(f"  - {model_name}: {status} - {model_info.get('description', '')}")
     
-    # Find enabled models
-    enabled_models = [model_name for model_name, model_info in models.items() 
-                     if model_info.get("enabled", False)]
-    
     if not enabled_models:
         logger.warning(f"No enabled models found. Using default model: {default_model}")
         return default_model
@@ -253,13 +296,21 @@ def get_transcription_model():
     return selected_model
 
 
-def transcribe_audio_file(client, file_path):
-    """Transcribe an audio file using OpenAI's API."""
+def transcribe_audio_file(client, file_path, duration=None):
+    """Transcribe an audio file using OpenAI's API.
+
+    Args:
+        client: OpenAI client instance
+        file_path: Path to the audio file
+        duration: Optional pre-computed duration in seconds; avoids a second
+                  ffprobe subprocess when the caller already calculated it
+    """
     try:
         logger.info(f"Transcribing {file_path}")
-        
+
         # Calculate estimated duration to log progress
-        duration = calculate_duration(file_path)
+        if duration is None:
+            duration = calculate_duration(file_path)
         if duration:
             logger.info(f"Estimated duration: {duration:.2f} seconds")
             
@@ -285,33 +336,46 @@ def transcribe_audio_file(client, file_path):
         logger.info(f"Using prompt: {prompt[:50]}..." if prompt and len(prompt) > 50 else f"Using prompt: {prompt}")
         
         start_time = time.time()
-        
-        # Open the audio file
-        with open(file_path, "rb") as audio_file:
-            # Prepare API call parameters
-            params = {
-                "model": model,
-                "file": audio_file
-            }
-            
-            # Add optional parameters if provided
-            # Only add language parameter if the model supports it or we don't know
-            supports_language = model_info.get("supports_language_parameter", True)
-            if language and supports_language:
-                params["language"] = language
-                logger.info(f"Using language parameter: {language}")
-            elif language and not supports_language:
-                logger.info(f"Model {model} auto-detects language, not using language parameter")
-                
-            if prompt:
-                params["prompt"] = prompt
-                
-            if response_format:
-                params["response_format"] = response_format
-            
-            # Call the OpenAI API
-            response = client.audio.transcriptions.create(**params)
-        
+
+        # Prepare API call parameters (the file handle is added per attempt)
+        params = {
+            "model": model
+        }
+
+        # Add optional parameters if provided
+        # Only add language parameter if the model supports it or we don't know
+        supports_language = model_info.get("supports_language_parameter", True)
+        if language and supports_language:
+            params["language"] = language
+            logger.info(f"Using language parameter: {language}")
+        elif language and not supports_language:
+            logger.info(f"Model {model} auto-detects language, not using language parameter")
+
+        if prompt:
+            params["prompt"] = prompt
+
+        if response_format:
+            params["response_format"] = response_format
+
+        # Call the OpenAI API, retrying transient failures (rate limits,
+        # 5xx, network blips) with exponential backoff plus jitter so one
+        # hiccup doesn't lose the transcription for this run
+        max_attempts = settings.get("max_retry_attempts", 3)
+        for attempt in range(max_attempts):
+            try:
+                with open(file_path, "rb") as audio_file:
+                    response = client.audio.transcriptions.create(file=audio_file, **params)
+                break
+            except Exception as api_error:
+                if attempt + 1 >= max_attempts:
+                    raise
+                delay = (2 ** attempt) + random.uniform(0, 0.5)
+                logger.warning(
+                    f"Transcription attempt {attempt + 1}/{max_attempts} failed "
+                    f"({api_error}); retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
         end_time = time.time()
         transcription_time = end_time - start_time
         
@@ -337,8 +401,7 @@ def transcribe_audio_file(client, file_path):
             
         return transcription
     except Exception as e:
-        logger.error(f"Error transcribing audio file: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Error transcribing audio file")
         return None
 
 
@@ -355,44 +418,46 @@ def get_audio_files(directory):
     
     if not audio_extensions:
         logger.error("Could not load audio extensions from config")
-        sys.exit(1)
+        return []
     
-    # Get all files with audio extensions
+    # Get all files with audio extensions in a single directory scan.
+    # os.scandir reuses the stat data returned by the OS, avoiding one
+    # glob pass (plus stat calls) per configured extension.
+    suffixes = tuple(audio_extensions)
     audio_files = []
-    for ext in audio_extensions:
-        audio_files.extend(directory.glob(f"*{ext}"))
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(suffixes):
+                audio_files.append(Path(entry.path))
     
     if not audio_files:
         return []
     
-    # Function to extract timestamp from filename if present
-    def get_timestamp_from_filename(filepath):
+    # Function to extract a sortable timestamp key from the filename if present.
+    # YYYYMMDD_HHMMSS strings are zero-padded, so lexicographic order equals
+    # chronological order - no datetime parsing needed.
+    def get_timestamp_key(filepath):
         filename = filepath.name
         # Try to extract timestamp in format YYYYMMDD_HHMMSS from filename
-        timestamp_match = re.search(r'(\d{8}_\d{6})', filename)
+        timestamp_match = TIMESTAMP_PATTERN.search(filename)
         if timestamp_match:
-            try:
-                # If timestamp found in filename, use it
-                timestamp_str = timestamp_match.group(1)
-                return datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-            except ValueError:
-                pass
-        
+            return timestamp_match.group(1)
+
         # Fall back to file creation time if no timestamp in filename
-        # or if timestamp couldn't be parsed
-        return datetime.fromtimestamp(os.path.getctime(filepath))
-    
+        return datetime.fromtimestamp(os.path.getctime(filepath)).strftime("%Y%m%d_%H%M%S")
+
     # Sort files by timestamp
     logger.info("Sorting audio files by creation time (chronological order)")
-    sorted_files = sorted(audio_files, key=get_timestamp_from_filename)
-    
+    keyed_files = sorted((get_timestamp_key(f), f) for f in audio_files)
+    sorted_files = [f for _, f in keyed_files]
+
     # Log the sorted files
     if sorted_files:
         logger.info("Files will be processed in the following order:")
-        for i, file in enumerate(sorted_files, 1):
-            timestamp = get_timestamp_from_filename(file)
-            logger.info(f"{i}. {file.name} (Created: {timestamp.strftime('%Y-%m-%d %H:%M:%S')})")
-    
+        for i, (ts, file) in enumerate(keyed_files, 1):
+            created = f"{ts[:4]}-{ts[4:6]}-{ts[6:8]} {ts[9:11]}:{ts[11:13]}:{ts[13:15]}"
+            logger.info(f"{i}. {file.name} (Created: {created})")
+
     return sorted_files
 
 
@@ -414,15 +479,17 @@ def save_transcription(text, output_path, file_name):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         output_file = output_path / f"{timestamp}_{file_name}"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
+        # 1 MiB buffer - the combined transcription text is written in one
+        # go, so a large buffer keeps the write to a handful of syscalls
+        # even when a big backlog produces a long file
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write(text)
-            
+
         logger.info(f"Transcription saved to {output_file}")
         return True
         
     except Exception as e:
-        logger.error(f"Error saving transcription: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Error saving transcription")
         return False
 
 
@@ -433,18 +500,34 @@ def process_audio_files(client, audio_files, output_path, output_file):
         return False
         
     logger.info(f"Found {len(audio_files)} audio file(s) to process")
-    
-    all_transcriptions = []
-    
-    for file_path in audio_files:
+
+    def _transcribe_one(file_path):
         logger.info(f"Processing {file_path}")
-        
+
+        # Calculate duration once per file; it is reused for the database save
+        # so the ffprobe subprocess only runs a single time
+        duration = calculate_duration(file_path)
+
         # Transcribe the audio file
-        transcription = transcribe_audio_file(client, file_path)
-        
+        transcription = transcribe_audio_file(client, file_path, duration=duration)
+        return duration, transcription
+
+    # Transcription is I/O bound (one API upload per file), so a small
+    # thread pool overlaps the round-trips when a backlog has piled up.
+    # executor.map preserves input order, keeping the combined output file
+    # deterministic; database saves stay on this thread.
+    max_workers = max(1, min(config.get("transcription_concurrency", 4), len(audio_files)))
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_transcribe_one, audio_files))
+    else:
+        results = [_transcribe_one(file_path) for file_path in audio_files]
+
+    all_transcriptions = []
+
+    for file_path, (duration, transcription) in zip(audio_files, results):
         if transcription:
             # Save transcription to database
-            duration = calculate_duration(file_path)
             try:
                 db_success = db_save_transcription(
                     content=transcription,
@@ -484,7 +567,7 @@ def ensure_env_file_exists():
     """
     try:
         # Get the source .env file path
-        src_env_path = Path(__file__).parent.parent / '.env'
+        src_env_path = PROJECT_ROOT / '.env'
         
         if src_env_path.exists():
             # Get the installed package location
@@ -527,13 +610,13 @@ def run_transcribe():
         
         if not gdrive_downloads_dir:
             logger.error("Downloads directory not found in Google Drive config")
-            sys.exit(1)
+            return False
             
         downloads_dir = Path(gdrive_downloads_dir)
         
         if not downloads_dir.exists():
             logger.error(f"Downloads directory {downloads_dir} does not exist")
-            sys.exit(1)
+            return False
         
         # Log the downloads directory being used
         logger.info(f"Using downloads directory: {downloads_dir}")
@@ -541,13 +624,13 @@ def run_transcribe():
         # Get output file name
         if "output_file" not in config:
             logger.error("output_file not found in configuration")
-            sys.exit(1)
+            return False
         output_file = config["output_file"]
         
         # Get output directory from config
         if "transcriptions_dir" not in config:
             logger.error("transcriptions_dir not found in configuration")
-            sys.exit(1)
+            return False
         output_dir = Path(config["transcriptions_dir"])
         
         # Create transcriptions output directory if it doesn't exist
@@ -560,7 +643,9 @@ def run_transcribe():
         
         # Get OpenAI client
         client = get_openai_client()
-        
+        if client is None:
+            return False
+
         # Get audio files in chronological order
         audio_files = get_audio_files(downloads_dir)
         
@@ -574,9 +659,8 @@ def run_transcribe():
             
         return success
     except Exception as e:
-        logger.error(f"Error running transcription process: {str(e)}")
-        traceback.print_exc()
-        sys.exit(1)
+        logger.exception("Error running transcription process")
+        return False
 
 
 def main():